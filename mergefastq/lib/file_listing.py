@@ -0,0 +1,63 @@
+# Project     : merge_fastq
+# File Name   : file_listing.py
+# Description : Functions for checking files against directory listings.
+# Author      : Todd N. Wylie
+# Email       : twylie@wustl.edu
+# Created     : Thu Oct 15 15:08:19 CDT 2026
+# Copyright   : Copyright (C) 2024 by T.N. Wylie. All rights reserved.
+
+import os
+
+
+def files_exist(file_paths: list) -> list:
+    """Check which of the given file paths are existing files.
+
+    Rather than stat each file in turn, we list each parent directory
+    once and check the file names against the listing. A missing parent
+    directory is treated as an empty listing. Symbolic links are
+    followed, as with Path.is_file().
+
+    An entry may also be a list or tuple of candidate file paths (e.g.
+    the compressed and decompressed names of one file), in which case
+    the entry passes if any of the candidates exists.
+
+    Parameters
+    ----------
+    file_paths : list
+        A list of file paths, or of lists of candidate file paths, to
+        check.
+
+    Raises
+    ------
+    None
+
+    Returns
+    -------
+    list
+        Returns a list of bool values, one per entry, True where the
+        file (or any of its candidates) exists.
+    """
+    dir_files: dict = dict()
+    is_file: list = list()
+    for entry_paths in file_paths:
+        if isinstance(entry_paths, (list, tuple)) is False:
+            entry_paths = [entry_paths]
+        is_found = False
+        for file_path in entry_paths:
+            parent, name = os.path.split(file_path)
+            if parent not in dir_files:
+                try:
+                    with os.scandir(parent or '.') as entries:
+                        dir_files[parent] = {
+                            entry.name for entry in entries
+                            if entry.is_file()
+                        }
+                except FileNotFoundError:
+                    dir_files[parent] = set()
+            if name in dir_files[parent]:
+                is_found = True
+                break
+        is_file.append(is_found)
+    return is_file
+
+# __END__
@@ -0,0 +1,193 @@
+# Project     : merge_fastq
+# File Name   : md5_writer.py
+# Description : A file writer that calculates an MD5 hash while writing.
+# Author      : Todd N. Wylie
+# Email       : twylie@wustl.edu
+# Created     : Thu Oct 15 09:12:44 CDT 2026
+# Copyright   : Copyright (C) 2024 by T.N. Wylie. All rights reserved.
+
+from typing_extensions import Self
+from typing import BinaryIO, Optional
+import hashlib
+
+
+class Md5Writer:
+    """A text writer that hashes content as it is written to disk.
+
+    Text passed to write() is collected in memory and, once the buffer
+    reaches buffer_size characters, is encoded, added to the MD5 hash,
+    and written to disk in one block. This lets us write a file and its
+    MD5 checksum in a single pass, rather than reading the file back
+    from disk to hash it, while keeping the number of write() calls on
+    the underlying file small.
+
+    Parameters
+    ----------
+    file_path : str
+        A qualified file path to write.
+
+    buffer_size : int [1048576]
+        The number of characters to collect before writing to disk.
+
+    Attributes
+    ----------
+    buffer_size : int
+        The number of characters to collect before writing to disk.
+
+    file_path : str
+        A qualified file path to write.
+
+    md5 : hashlib._Hash
+        The running MD5 hash of all content written.
+
+    Methods
+    -------
+    write(text) -> int
+        Add text to the write buffer.
+
+    flush()
+        Write buffered text to disk and update the MD5 hash.
+
+    hexdigest() -> str
+        Return the MD5 hash value of all content written so far.
+
+    Examples
+    --------
+    with Md5Writer(file_path=file_path) as fho:
+        df.to_csv(fho, sep='\t', index=False)
+    md5 = fho.hexdigest()
+    """
+
+    def __init__(self: Self, file_path: str,
+                 buffer_size: int = 1024 * 1024) -> None:
+        """Construct the class.
+
+        Parameters
+        ----------
+        file_path : str
+            A qualified file path to write.
+
+        buffer_size : int [1048576]
+            The number of characters to collect before writing to disk.
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.md5 = hashlib.md5(usedforsecurity=False)
+        self.__fh: Optional[BinaryIO] = None
+        self.__buffer: list = list()
+        self.__buffer_len = 0
+        return
+
+    def __enter__(self: Self) -> Self:
+        """Open the file for writing.
+
+        Parameters
+        ----------
+        None
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        Md5Writer
+            Returns the open writer.
+        """
+        self.__fh = open(self.file_path, 'wb', buffering=self.buffer_size)
+        return self
+
+    def __exit__(self: Self, *exc_info: object) -> None:
+        """Flush any buffered text and close the file.
+
+        Parameters
+        ----------
+        exc_info : object
+            Exception information, if any, as passed by the with
+            statement.
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.flush()
+        self.__fh.close()  # type: ignore
+        return
+
+    def write(self: Self, text: str) -> int:
+        """Add text to the write buffer.
+
+        Parameters
+        ----------
+        text : str
+            Text to be written to the file.
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        int
+            Returns the number of characters written.
+        """
+        self.__buffer.append(text)
+        self.__buffer_len += len(text)
+        if self.__buffer_len >= self.buffer_size:
+            self.flush()
+        return len(text)
+
+    def flush(self: Self) -> None:
+        """Write buffered text to disk and update the MD5 hash.
+
+        Parameters
+        ----------
+        None
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        None
+        """
+        if self.__buffer_len > 0:
+            data = ''.join(self.__buffer).encode('utf-8')
+            self.md5.update(data)
+            self.__fh.write(data)  # type: ignore
+            self.__buffer.clear()
+            self.__buffer_len = 0
+        return
+
+    def hexdigest(self: Self) -> str:
+        """Return the MD5 hash value of all content written so far.
+
+        Parameters
+        ----------
+        None
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        str
+            Returns a MD5 hash value for the written content.
+        """
+        return self.md5.hexdigest()
+
+# __END__
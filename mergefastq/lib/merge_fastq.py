@@ -10,13 +10,96 @@ import mergefastq  # type: ignore
 import argparse
 from . rename_samples import RenameSamples  # type: ignore
 from . samplemap import Samplemap  # type: ignore
+from . md5_writer import Md5Writer  # type: ignore
 from typing_extensions import Self
 from pathlib import Path
-import hashlib
 import gzip
 from datetime import datetime
 
 
+# Header block for the merged samplemap tsv file; see
+# MergeFastq.__format_tsv_header().
+MERGED_TSV_HEADER = """\
+# Begin file text.
+#
+# Project     : {project}
+# File Name   : {file_path_name}
+# Description : A dataframe of merged FASTQ file sequencing
+#               information based on Samplemap.csv files.
+# Created     : {date}
+#
+# Fields
+# ------
+# fastq : STR
+#     The name of the FASTQ file. Will be either R1 or R2 type.
+#
+# flow_cell_id : STR
+#     Sequencing flow cell id from which the sample's FASTQ file was
+#     derived.
+#
+# index_sequence : STR
+#     Molecular barcode used to identify the sequenced sample.
+#
+# lane_number : INT
+#     Flow cell lane in which the sample was sequenced.
+#
+# read_number : INT
+#     Read-end, R1 or R2, for the sequenced read-pair.
+#
+# sample_name : STR
+#     Original sample name as provided by the sequencing core.
+#
+# library_type : STR
+#     Library type as provided by the sequencing core.
+#
+# total_bases : INT
+#     Summed base count using both read-pairs in the sample, as
+#     provided by the sequencing core.
+#
+# samplemap_path : STR
+#     The Samplemap.csv file from which the sample was taken.
+#
+# gtac_fastq_reads : INT
+#     Read count for the FASTQ file provided by the sequencing core.
+#
+# esp_id : STR
+#     ESP ID is an auto-generated ID from the sequencing core's LIMS
+#     system; each entity type has one.
+#
+# pool_name : STR
+#     Sequencing pool identifier.
+#
+# batch_id : INT
+#     The sequencing batch as determined by individual Samplemap.csv
+#     files.
+#
+# fastq_path : STR
+#     File path to the original, source FASTQ file used in merging.
+#
+# project : STR
+#     The project name/tag associated with the FASTQ file.
+#
+# revised_sample_name : STR
+#     A revised sample name used in merging and downstream analysis.
+#
+# merged_commands : STR
+#     The shell commands used to create the associated merged
+#     FASTQ file.
+#
+# merged_fastq_path : STR
+#     File path to the merged FASTQ file.
+#
+# gtac_end_pair_reads : INT
+#     Summed read count using all end-pairs in a FASTQ merge, as
+#     provided by the sequencing core.
+#
+# gtac_sample_reads : INT
+#     Summed read count using both read-pairs in the sample, as
+#     provided by the sequencing core.
+#
+"""
+
+
 class MergeFastq:
     """A class for merging split FASTQ provided by GTAC@MGI.
 
@@ -173,7 +256,7 @@ class MergeFastq:
         -------
         None
         """
-        df = self.samplemap.copy_df()
+        df = self.samplemap_merged
         dfg = df.groupby('sample_name')
         single_copy_ids: set = set()
         merge_copy_ids: set = set()
@@ -241,7 +324,7 @@ class MergeFastq:
         -------
         None
         """
-        df_smaps = self.samplemap.copy_df()
+        df_smaps = self.samplemap_merged
         dfg_ids = df_smaps.groupby('sample_name')
         for sample_name in self.single_copy_ids:
             df = dfg_ids.get_group(sample_name)
@@ -433,7 +516,7 @@ class MergeFastq:
         ValueError
             FASTQ R2 comp or decomp file not found.
         """
-        df_smaps = self.samplemap.copy_df()
+        df_smaps = self.samplemap_merged
         dfg_ids = df_smaps.groupby('sample_name')
         for sample_name in self.merge_copy_ids:
             df = dfg_ids.get_group(sample_name)
@@ -799,28 +882,6 @@ class MergeFastq:
             self.samplemap_merged['merged_fastq_path'] = col_dest_fq_path
         return
 
-    def __calc_file_md5(self: Self, file_path: str) -> str:
-        """Returns the MD5 hash for a specified file.
-
-        Parameters
-        ----------
-        file_path : str
-            A qualified file path for which to calculate the MD5 hash.
-
-        Raises
-        ------
-        None
-
-        Returns
-        -------
-        str
-            Returns a MD5 hash value for the supplied file.
-        """
-        with open(file_path, 'rb') as fh:
-            data = fh.read()
-            md5sum = hashlib.md5(data).hexdigest()
-        return md5sum
-
     def write_df(self: Self, file_path: str) -> None:
         """Write the merged FASTQ dataframe to a tab-delimited file.
 
@@ -848,11 +909,11 @@ class MergeFastq:
         None
         """
         header = self.__format_tsv_header(file_path=file_path)
-        with open(file_path, 'w') as fho:
+        with Md5Writer(file_path=file_path) as fho:
             fho.write(header)
             self.samplemap_merged.to_csv(fho, sep='\t', index=False)
             fho.write('# End file text.\n')
-        md5 = self.__calc_file_md5(file_path=file_path)
+        md5 = fho.hexdigest()
         md5_path = file_path + '.MD5'
         with open(md5_path, 'w') as fh:
             fh.write(f'MD5 ({file_path}) = {md5}\n')
@@ -880,87 +941,11 @@ class MergeFastq:
         """
         file_path_name = Path(file_path).name
         date = datetime.now().strftime("%a %d. %b %H:%M:%S %Z %Y")
-        from textwrap import dedent
-        project = self.args.project
-        header = dedent(f"""\
-        # Begin file text.
-        #
-        # Project     : {project}
-        # File Name   : {file_path_name}
-        # Description : A dataframe of merged FASTQ file sequencing
-        #               information based on Samplemap.csv files.
-        # Created     : {date}
-        #
-        # Fields
-        # ------
-        # fastq : STR
-        #     The name of the FASTQ file. Will be either R1 or R2 type.
-        #
-        # flow_cell_id : STR
-        #     Sequencing flow cell id from which the sample's FASTQ file was
-        #     derived.
-        #
-        # index_sequence : STR
-        #     Molecular barcode used to identify the sequenced sample.
-        #
-        # lane_number : INT
-        #     Flow cell lane in which the sample was sequenced.
-        #
-        # read_number : INT
-        #     Read-end, R1 or R2, for the sequenced read-pair.
-        #
-        # sample_name : STR
-        #     Original sample name as provided by the sequencing core.
-        #
-        # library_type : STR
-        #     Library type as provided by the sequencing core.
-        #
-        # total_bases : INT
-        #     Summed base count using both read-pairs in the sample, as
-        #     provided by the sequencing core.
-        #
-        # samplemap_path : STR
-        #     The Samplemap.csv file from which the sample was taken.
-        #
-        # gtac_fastq_reads : INT
-        #     Read count for the FASTQ file provided by the sequencing core.
-        #
-        # esp_id : STR
-        #     ESP ID is an auto-generated ID from the sequencing core's LIMS
-        #     system; each entity type has one.
-        #
-        # pool_name : STR
-        #     Sequencing pool identifier.
-        #
-        # batch_id : INT
-        #     The sequencing batch as determined by individual Samplemap.csv
-        #     files.
-        #
-        # fastq_path : STR
-        #     File path to the original, source FASTQ file used in merging.
-        #
-        # project : STR
-        #     The project name/tag associated with the FASTQ file.
-        #
-        # revised_sample_name : STR
-        #     A revised sample name used in merging and downstream analysis.
-        #
-        # merged_commands : STR
-        #     The shell commands used to create the associated merged
-        #     FASTQ file.
-        #
-        # merged_fastq_path : STR
-        #     File path to the merged FASTQ file.
-        #
-        # gtac_end_pair_reads : INT
-        #     Summed read count using all end-pairs in a FASTQ merge, as
-        #     provided by the sequencing core.
-        #
-        # gtac_sample_reads : INT
-        #     Summed read count using both read-pairs in the sample, as
-        #     provided by the sequencing core.
-        #
-        """)
+        header = MERGED_TSV_HEADER.format(
+            project=self.args.project,
+            file_path_name=file_path_name,
+            date=date
+        )
         return header
 
     def __update_df_read_counts(self: Self) -> None:
@@ -999,12 +984,12 @@ class MergeFastq:
         None
         """
         count_index: dict = dict()
-        df = self.samplemap_merged.copy()
+        df = self.samplemap_merged
         dfg = df.groupby(['sample_name', 'read_number'])
         for i in dfg.groups:
             sample_name, read_number = i
             dfi = dfg.get_group(i)
-            merged_count = dfi.sum()['gtac_fastq_reads']
+            merged_count = dfi['gtac_fastq_reads'].sum()
             count_index[sample_name] = {'merged_count': merged_count}
 
         col_end_pair_counts: list = list()
@@ -1029,28 +1014,29 @@ class MergeFastq:
         self.samplemap_merged['gtac_end_pair_reads'] = col_end_pair_counts
         self.samplemap_merged['gtac_sample_reads'] = col_sample_counts
 
-        dfg = self.samplemap_merged.groupby('revised_sample_name')
-        for sample_name in dfg.groups:
-            dfi = dfg.get_group(sample_name)
-            dfg_r1_fastq = dfi.groupby('read_number').get_group(1)
-            r1_sample_counts = list(set(dfg_r1_fastq['gtac_sample_reads']))[0]
-            r1_ep_counts = list(set(dfg_r1_fastq['gtac_end_pair_reads']))[0]
-            dfg_r2_fastq = dfi.groupby('read_number').get_group(2)
-            r2_sample_counts = list(set(dfg_r2_fastq['gtac_sample_reads']))[0]
-            r2_ep_counts = list(set(dfg_r2_fastq['gtac_end_pair_reads']))[0]
-            if r1_sample_counts != r2_sample_counts:
-                raise ValueError(
-                    'GTAC sample counts do not match for R1 & R2.',
-                    sample_name,
-                    f'R1={r1_sample_counts}',
-                    f'R2={r2_sample_counts}'
-                )
-            if r1_ep_counts != r2_ep_counts:
+        df_counts = self.samplemap_merged.pivot_table(
+            index='revised_sample_name',
+            columns='read_number',
+            values=['gtac_sample_reads', 'gtac_end_pair_reads'],
+            aggfunc='first'
+        )
+        count_checks = (
+            ('gtac_sample_reads',
+             'GTAC sample counts do not match for R1 & R2.'),
+            ('gtac_end_pair_reads',
+             'GTAC end pair counts do not match for R1 & R2.')
+        )
+        for col, message in count_checks:
+            r1_counts = df_counts[(col, 1)]
+            r2_counts = df_counts[(col, 2)]
+            is_diff = r1_counts != r2_counts
+            if is_diff.any():
+                sample_name = is_diff.idxmax()
                 raise ValueError(
-                    'GTAC end pair counts do not match for R1 & R2.',
+                    message,
                     sample_name,
-                    f'R1={r1_ep_counts}',
-                    f'R2={r2_ep_counts}'
+                    f'R1={r1_counts[sample_name]}',
+                    f'R2={r2_counts[sample_name]}'
                 )
         return
 
@@ -1077,39 +1063,33 @@ class MergeFastq:
         -------
         None
         """
-        df_merged = self.samplemap_merged.copy()
-        col_merge_cmds: list = list()
-        for i in df_merged.index:
-            df = df_merged.loc[i]
-            sample_name = df['sample_name']
-            read_number = df['read_number']
-            if sample_name in self.copy_cmds.keys():
-                r1_cmd, r2_cmd = self.copy_cmds[sample_name]
-                if read_number == 1:
-                    col_merge_cmds.append(r1_cmd)
-                elif read_number == 2:
-                    col_merge_cmds.append(r2_cmd)
-                else:
-                    raise ValueError(
-                        'Unknown read number.',
-                        read_number
-                    )
-            elif sample_name in self.merge_cmds.keys():
-                r1_cmd, r2_cmd = self.merge_cmds[sample_name]
-                if read_number == 1:
-                    col_merge_cmds.append(r1_cmd)
-                elif read_number == 2:
-                    col_merge_cmds.append(r2_cmd)
-                else:
-                    raise ValueError(
-                        'Unknown read number.',
-                        read_number
-                    )
-            else:
-                raise KeyError(
-                    'Sample name missing in copy commands keys.',
-                    sample_name
-                )
+        # Copy commands take precedence over merge commands for a sample
+        # name found in both lookups.
+        sample_cmds = {**self.merge_cmds, **self.copy_cmds}
+        r1_cmds = {name: cmds[0] for name, cmds in sample_cmds.items()}
+        r2_cmds = {name: cmds[1] for name, cmds in sample_cmds.items()}
+
+        sample_names = self.samplemap_merged['sample_name']
+        read_numbers = self.samplemap_merged['read_number']
+
+        is_missing = ~sample_names.isin(sample_cmds.keys())
+        if is_missing.any():
+            raise KeyError(
+                'Sample name missing in copy commands keys.',
+                sample_names[is_missing].iat[0]
+            )
+
+        is_unknown = ~read_numbers.isin((1, 2))
+        if is_unknown.any():
+            raise ValueError(
+                'Unknown read number.',
+                read_numbers[is_unknown].iat[0]
+            )
+
+        col_merge_cmds = sample_names.map(r1_cmds).where(
+            read_numbers == 1,
+            sample_names.map(r2_cmds)
+        )
         self.samplemap_merged['merged_commands'] = col_merge_cmds
         return
 
@@ -0,0 +1,87 @@
+# Project     : merge_fastq
+# File Name   : merged_samplemap.py
+# Description : Functions for loading a merged samplemap file.
+# Author      : Todd N. Wylie
+# Email       : twylie@wustl.edu
+# Created     : Thu Oct 15 10:02:17 CDT 2026
+# Copyright   : Copyright (C) 2024 by T.N. Wylie. All rights reserved.
+
+import pandas as pd  # type: ignore
+from pandas import DataFrame
+from pathlib import Path
+from typing import Optional
+
+
+# Compact column types for the merged samplemap file. Small integer
+# types and categorical sample names keep the dataframe small and make
+# grouping on these columns cheaper.
+COMPACT_DTYPES = {
+    'lane_number': 'int8',
+    'read_number': 'int8',
+    'batch_id': 'int16',
+    'flow_cell_id': 'category',
+    'sample_name': 'category',
+    'revised_sample_name': 'category'
+}
+
+# Known column types for the merged samplemap file, as written by the
+# MergeFastq class. Declaring these up front spares read_csv() from
+# inferring types column by column.
+MERGED_DTYPES = {
+    'fastq': str,
+    'index_sequence': str,
+    'library_type': str,
+    'total_bases': 'Int64',
+    'samplemap_path': str,
+    'gtac_fastq_reads': 'Int64',
+    'esp_id': str,
+    'fastq_path': str,
+    'project': str,
+    'merged_commands': str,
+    'merged_fastq_path': str,
+    'gtac_end_pair_reads': 'int64',
+    'gtac_sample_reads': 'int64',
+    **COMPACT_DTYPES
+}
+
+
+def read_merged_samplemap(file_path: str,
+                          usecols: Optional[list] = None) -> DataFrame:
+    """Load a merged samplemap file into a dataframe.
+
+    Column types are declared up front (MERGED_DTYPES), so read_csv()
+    does not infer them, and columns are cast to COMPACT_DTYPES.
+
+    Parameters
+    ----------
+    file_path : str
+        A qualified path to a merged samplemap file as written by the
+        MergeFastq class.
+
+    usecols : list [None]
+        A list of column names to load. All columns are loaded by
+        default.
+
+    Raises
+    ------
+    FileNotFoundError
+        Merged samplemap file does not exist.
+
+    Returns
+    -------
+    DataFrame
+        Returns a dataframe of the merged samplemap.
+    """
+    merged_tsv_path = Path(file_path)
+    if merged_tsv_path.is_file() is False:
+        raise FileNotFoundError(
+            'Merged samplemap file does not exist.',
+            file_path
+        )
+    # The pyarrow engine does not support comment lines, which the
+    # merged samplemap file uses for its header and footer.
+    df = pd.read_csv(file_path, sep='\t', comment='#', usecols=usecols,
+                     dtype=MERGED_DTYPES, engine='c', memory_map=True)
+    return df
+
+# __END__
@@ -10,8 +10,12 @@ import argparse
 import pandas as pd  # type: ignore
 from pandas import DataFrame
 from typing_extensions import Self
-from pathlib import Path
-import hashlib
+from . merged_samplemap import read_merged_samplemap  # type: ignore
+from . target_coverage import calc_perct_of_target  # type: ignore
+from . target_coverage import TARGET_READ_COUNTS  # type: ignore
+from . target_coverage import TARGET_PERCT_LABELS  # type: ignore
+from . target_coverage import TARGET_IS_PASSED_LABELS  # type: ignore
+from . md5_writer import Md5Writer  # type: ignore
 
 
 class ReadCountsGtac:
@@ -52,6 +56,12 @@ class ReadCountsGtac:
         throughput of a given sample. Update this tuple to reduce or
         expand the number of evaluations.
 
+    target_is_passed_labels : tuple
+        Column labels for the pass/fail state of each target count.
+
+    target_perct_labels : tuple
+        Column labels for the percent of each target count.
+
     target_min_perct = int [80]
         The minimum percent of target sequence throughput for a sample
         to pass.
@@ -102,6 +112,8 @@ class ReadCountsGtac:
         self.df_merged: DataFrame = DataFrame()
         self.target_min_perct = 80
         self.target_counts: tuple = tuple()
+        self.target_perct_labels: tuple = tuple()
+        self.target_is_passed_labels: tuple = tuple()
         self.__set_target_coverages()
         self.__populate_df()
         return
@@ -109,6 +121,9 @@ class ReadCountsGtac:
     def __populate_df(self: Self) -> None:
         """Populate the merged samplemap dataframe.
 
+        Only the columns needed for read count evaluation are loaded;
+        see read_merged_samplemap() for details.
+
         Parameters
         ----------
         None
@@ -122,15 +137,16 @@ class ReadCountsGtac:
         -------
         None
         """
-        merged_tsv_path = Path(self.merged_tsv)
-        if merged_tsv_path.is_file() is False:
-            raise FileNotFoundError(
-                'Merged samplemap file does not exist.',
-                self.merged_tsv
-            )
-        else:
-            self.df_merged = pd.read_csv(self.merged_tsv, sep='\t',
-                                         comment='#')
+        self.df_merged = read_merged_samplemap(
+            file_path=self.merged_tsv,
+            usecols=[
+                'revised_sample_name',
+                'samplemap_path',
+                'read_number',
+                'gtac_end_pair_reads',
+                'gtac_sample_reads'
+            ]
+        )
         return
 
     def __set_target_coverages(self: Self) -> None:
@@ -138,7 +154,8 @@ class ReadCountsGtac:
 
         We are populating a predefined set of target read counts values
         that will be used to evaluate actual read counts from FASTQ
-        files.
+        files. The values and their column labels are shared with the
+        ReadCountsSource class; see TARGET_READ_COUNTS.
 
         Parameters
         ----------
@@ -152,28 +169,9 @@ class ReadCountsGtac:
         -------
         None
         """
-        target_read_counts = (
-            100_000,
-            200_000,
-            300_000,
-            400_000,
-            500_000,
-            1_000_000,
-            1_500_000,
-            2_000_000,
-            2_500_000,
-            3_000_000,
-            3_500_000,
-            4_000_000,
-            4_500_000,
-            5_000_000,
-            10_000_000,
-            20_000_000,
-            30_000_000,
-            40_000_000,
-            50_000_000
-        )
-        self.target_counts = target_read_counts
+        self.target_counts = TARGET_READ_COUNTS
+        self.target_perct_labels = TARGET_PERCT_LABELS
+        self.target_is_passed_labels = TARGET_IS_PASSED_LABELS
         return
 
     def calc_gtac_read_coverage(self: Self) -> None:
@@ -210,50 +208,31 @@ class ReadCountsGtac:
         None
         """
         df = self.df_merged.copy()
-        dfg = df.groupby('revised_sample_name')
+        dfg = df.groupby('revised_sample_name', observed=True)
         col_sample_name: list = list()
         col_r1_counts: list = list()
         col_r2_counts: list = list()
         col_sample_counts: list = list()
         col_target_min_perct: list = list()
         col_samplemap_path: list = list()
-        target_cols: dict = dict()
 
-        for i, sample_name in enumerate(dfg.groups):
+        for sample_name in dfg.groups:
             col_sample_name.append(sample_name)
             col_target_min_perct.append(self.target_min_perct)
             dfi = dfg.get_group(sample_name)
-            samplemap_path = list(set(dfi['samplemap_path']))[0]
+            samplemap_path = dfi['samplemap_path'].iat[0]
             col_samplemap_path.append(samplemap_path)
-            sample_counts = list(set(dfi['gtac_sample_reads']))[0]
+            sample_counts = int(dfi['gtac_sample_reads'].iat[0])
             col_sample_counts.append(sample_counts)
             dfg_rn = dfi.groupby('read_number')
-            r1_counts = list(set(
-                dfg_rn.get_group(1)['gtac_end_pair_reads']
-            ))[0]
+            r1_counts = int(
+                dfg_rn.get_group(1)['gtac_end_pair_reads'].iat[0]
+            )
             col_r1_counts.append(r1_counts)
-            r2_counts = list(set(
-                dfg_rn.get_group(2)['gtac_end_pair_reads']
-            ))[0]
+            r2_counts = int(
+                dfg_rn.get_group(2)['gtac_end_pair_reads'].iat[0]
+            )
             col_r2_counts.append(r2_counts)
-            target_cols[i] = {
-                'col_target_counts': list(),
-                'col_perct_of_target': list(),
-                'col_is_pass_perct_target': list()
-            }
-            for target_counts in self.target_counts:
-                target_cols[i]['col_target_counts'].append(target_counts)
-                perct_of_target = round(
-                    ((sample_counts / 2) / target_counts) * 100, 2
-                )
-                target_cols[i]['col_perct_of_target'].append(perct_of_target)
-                if perct_of_target < self.target_min_perct:
-                    is_passed_perct_target = False
-                else:
-                    is_passed_perct_target = True
-                target_cols[i]['col_is_pass_perct_target'].append(
-                    is_passed_perct_target
-                )
 
         if (col_r1_counts == col_r2_counts) is False:
             raise ValueError('Read counts differ for R1 and R2 columns.')
@@ -274,67 +253,35 @@ class ReadCountsGtac:
             'sample_counts': col_sample_counts
         })
         df_tmp['sum'] = df_tmp['r1_counts'] + df_tmp['r2_counts']
-        if list(df_tmp['sample_counts']) == list(df_tmp['sum']) is False:
+        if list(df_tmp['sample_counts']) != list(df_tmp['sum']):
             raise ValueError(
                 'R1 and R2 read count sum differ froms sample count.'
             )
 
-        df_seqcov = pd.DataFrame()
-        df_seqcov['sample_name'] = col_sample_name
-        df_seqcov['samplemap_path'] = col_samplemap_path
-        df_seqcov['r1_read_counts'] = col_r1_counts
-        df_seqcov['r2_read_counts'] = col_r2_counts
-        df_seqcov['sample_read_counts'] = col_sample_counts
-        df_seqcov['min_target_perct_cov'] = col_target_min_perct
-
-        collection: dict = dict()
-        for i, target_count in enumerate(target_cols[0]['col_target_counts']):
-            # We may use the first entry to setup the target labels for
-            # all of the entries in the collection.
-            collection[i] = {
-                'perct_label': f'perct_of_{target_count}',
-                'col_perct_of_target': list(),
-                'is_passed_label': f'is_passed_{target_count}',
-                'is_pass_perct_target': list()
-            }
-
-        for i in sorted(collection.keys()):
-            for sample_i in sorted(target_cols):
-                perct = target_cols[sample_i]['col_perct_of_target'][i]
-                is_pass = target_cols[sample_i]['col_is_pass_perct_target'][i]
-                collection[i]['col_perct_of_target'].append(perct)
-                collection[i]['is_pass_perct_target'].append(is_pass)
-
-        for i in sorted(collection):
-            perct_label = collection[i]['perct_label']
-            is_passed_label = collection[i]['is_passed_label']
-            df_seqcov[perct_label] = collection[i]['col_perct_of_target']
-            df_seqcov[is_passed_label] = collection[i]['is_pass_perct_target']
+        # Percent of each target (columns) for each sample (rows).
+        perct_of_target, is_passed_perct_target = calc_perct_of_target(
+            sample_counts=col_sample_counts,
+            target_counts=self.target_counts,
+            target_min_perct=self.target_min_perct
+        )
+
+        seqcov_cols: dict = {
+            'sample_name': col_sample_name,
+            'samplemap_path': col_samplemap_path,
+            'r1_read_counts': col_r1_counts,
+            'r2_read_counts': col_r2_counts,
+            'sample_read_counts': col_sample_counts,
+            'min_target_perct_cov': col_target_min_perct
+        }
+        for i, perct_label in enumerate(self.target_perct_labels):
+            is_passed_label = self.target_is_passed_labels[i]
+            seqcov_cols[perct_label] = perct_of_target[:, i]
+            seqcov_cols[is_passed_label] = is_passed_perct_target[:, i]
+        df_seqcov = pd.DataFrame(seqcov_cols)
 
         self.df_gtac_seqcov = df_seqcov
         return
 
-    def __calc_file_md5(self: Self, file_path: str) -> str:
-        """Returns the MD5 hash for a specified file.
-
-        Parameters
-        ----------
-        file_path : str
-            A qualified file path for which to calculate the MD5 hash.
-
-        Raises
-        ------
-        None
-
-        Returns
-        -------
-        None
-        """
-        with open(file_path, 'rb') as fh:
-            data = fh.read()
-            md5sum = hashlib.md5(data).hexdigest()
-        return md5sum
-
     def write_df(self: Self, file_path: str) -> None:
         """Write the GTAC read count dataframe to a tab-delimited file.
 
@@ -351,8 +298,9 @@ class ReadCountsGtac:
         -------
         None
         """
-        self.df_gtac_seqcov.to_csv(file_path, sep='\t', index=False)
-        md5 = self.__calc_file_md5(file_path=file_path)
+        with Md5Writer(file_path=file_path) as fho:
+            self.df_gtac_seqcov.to_csv(fho, sep='\t', index=False)
+        md5 = fho.hexdigest()
         md5_path = file_path + '.MD5'
         with open(md5_path, 'w') as fh:
             fh.write(f'MD5 ({file_path}) = {md5}\n')
@@ -11,7 +11,14 @@ import pandas as pd  # type: ignore
 from pandas import DataFrame
 from typing_extensions import Self
 from pathlib import Path
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from . merged_samplemap import read_merged_samplemap  # type: ignore
+from . target_coverage import calc_perct_of_target  # type: ignore
+from . target_coverage import TARGET_READ_COUNTS  # type: ignore
+from . target_coverage import TARGET_PERCT_LABELS  # type: ignore
+from . target_coverage import TARGET_IS_PASSED_LABELS  # type: ignore
+from . md5_writer import Md5Writer  # type: ignore
+from . file_listing import files_exist  # type: ignore
 
 
 class ReadCountsSource():
@@ -56,6 +63,12 @@ class ReadCountsSource():
         throughput of a given sample. Update this tuple to reduce or
         expand the number of evaluations.
 
+    target_is_passed_labels : tuple
+        Column labels for the pass/fail state of each target count.
+
+    target_perct_labels : tuple
+        Column labels for the percent of each target count.
+
     target_min_perct = int [80]
         The minimum percent of target sequence throughput for a sample
         to pass.
@@ -100,6 +113,8 @@ class ReadCountsSource():
         self.df_gtac_counts: DataFrame = DataFrame()
         self.target_min_perct = 80
         self.target_counts: tuple = tuple()
+        self.target_perct_labels: tuple = tuple()
+        self.target_is_passed_labels: tuple = tuple()
         self.__set_target_coverages()
         self.__populate_gtac_df()
         self.__populate_merged_df()
@@ -118,7 +133,8 @@ class ReadCountsSource():
 
         We are populating a predefined set of target read counts values
         that will be used to evaluate actual read counts from FASTQ
-        files.
+        files. The values and their column labels are shared with the
+        ReadCountsGtac class; see TARGET_READ_COUNTS.
 
         Parameters
         ----------
@@ -132,33 +148,17 @@ class ReadCountsSource():
         -------
         None
         """
-        target_read_counts = (
-            100_000,
-            200_000,
-            300_000,
-            400_000,
-            500_000,
-            1_000_000,
-            1_500_000,
-            2_000_000,
-            2_500_000,
-            3_000_000,
-            3_500_000,
-            4_000_000,
-            4_500_000,
-            5_000_000,
-            10_000_000,
-            20_000_000,
-            30_000_000,
-            40_000_000,
-            50_000_000
-        )
-        self.target_counts = target_read_counts
+        self.target_counts = TARGET_READ_COUNTS
+        self.target_perct_labels = TARGET_PERCT_LABELS
+        self.target_is_passed_labels = TARGET_IS_PASSED_LABELS
         return
 
     def __populate_merged_df(self: Self) -> None:
         """Populate the merged FASTQ dataframe.
 
+        Only the columns needed for read count evaluation are loaded;
+        see read_merged_samplemap() for details.
+
         Parameters
         ----------
         None
@@ -172,15 +172,16 @@ class ReadCountsSource():
         -------
         None
         """
-        merged_tsv_path = Path(self.merged_samplemap)
-        if merged_tsv_path.is_file() is False:
-            raise FileNotFoundError(
-                'Merged samplemap file does not exist.',
-                self.merged_samplemap
-            )
-        else:
-            self.df_merged = pd.read_csv(self.merged_samplemap,
-                                         sep='\t', comment='#')
+        self.df_merged = read_merged_samplemap(
+            file_path=self.merged_samplemap,
+            usecols=[
+                'sample_name',
+                'revised_sample_name',
+                'samplemap_path',
+                'read_number',
+                'merged_fastq_path'
+            ]
+        )
         return
 
     def __col_src_end_pair_reads(self: Self) -> None:
@@ -203,30 +204,77 @@ class ReadCountsSource():
         -------
         None
         """
-        df = self.df_merged.copy()
-        col_counts: list = list()
-        for i in df.index:
-            dfi = df.loc[i]
-            fastq_counts = dfi['merged_fastq_path'] + '.counts'
-            if Path(fastq_counts).is_file() is False:
-                raise FileNotFoundError(
-                    'FASTQ counts file not found.',
-                    fastq_counts
-                )
-            else:
-                with open(fastq_counts, 'r') as fhi:
-                    for line in fhi:
-                        read_counts = line.strip()
-                        counts = int(read_counts)
-                        col_counts.append(counts)
-
-        if len(col_counts) == len(df.index) is False:
+        df = self.df_merged
+        fastq_counts = [
+            merged_fastq_path + '.counts'
+            for merged_fastq_path in df['merged_fastq_path'].tolist()
+        ]
+        self.__eval_fastq_counts_exist(fastq_counts=fastq_counts)
+        # Counts files are tiny, so reading them is dominated by file
+        # open latency; overlap the reads across threads. Results are
+        # returned in input order.
+        max_workers = max(1, min(32, len(fastq_counts)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            col_counts = list(
+                executor.map(self.__read_fastq_counts, fastq_counts)
+            )
+
+        if len(col_counts) != len(df.index):
             raise ValueError('Read counts column length and dataframe '
                              'length are not equal.')
         else:
             self.df_merged['src_end_pair_reads'] = col_counts
         return
 
+    def __read_fastq_counts(self: Self, fastq_counts: str) -> int:
+        """Return the read count stored in a FASTQ counts file.
+
+        Parameters
+        ----------
+        fastq_counts : str
+            A qualified path to a FASTQ counts file, as written by the
+            MergeFastq LSF jobs.
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        int
+            Returns the read count for the FASTQ file.
+        """
+        return int(Path(fastq_counts).read_text().strip())
+
+    def __eval_fastq_counts_exist(self: Self, fastq_counts: list) -> None:
+        """Evaluate that all of the FASTQ counts files exist.
+
+        See files_exist() for how the files are checked.
+
+        Parameters
+        ----------
+        fastq_counts : list
+            A list of qualified paths to FASTQ counts files.
+
+        Raises
+        ------
+        FileNotFoundError
+            FASTQ counts file not found.
+
+        Returns
+        -------
+        None
+        """
+        for fastq_count, is_file in zip(
+            fastq_counts, files_exist(file_paths=fastq_counts)
+        ):
+            if is_file is False:
+                raise FileNotFoundError(
+                    'FASTQ counts file not found.',
+                    fastq_count
+                )
+        return
+
     def __col_src_sample_reads(self: Self) -> None:
         """Update the source sample counts in the dataframe.
 
@@ -257,34 +305,23 @@ class ReadCountsSource():
         -------
         None
         """
-        df = self.df_merged.copy()
-
-        count_index: dict = dict()
-        df = self.df_merged.copy()
-        dfg = df.groupby(['sample_name', 'read_number'])
-        for i in dfg.groups:
-            # NOTE: The src_end_pair_reads values are already merged for
-            # a sample's read-end, since the source counts are on the
-            # merged FASTQ read-end file. Therefore a sample_counts
-            # value is double a given src_end_pair_reads value for a
-            # sample.
-            sample_name, read_number = i
-            dfi = dfg.get_group(i)
-            end_pair_count = len(dfi['src_end_pair_reads'])
-            if len(set(dfi['src_end_pair_reads'])) > 1:
-                raise ValueError('Source end pair counts should be equal '
-                                 'for all same-end entries.')
-            if end_pair_count == 1:
-                sample_counts = dfi['src_end_pair_reads'].item() * 2
-            elif end_pair_count > 1:
-                sample_counts = dfi['src_end_pair_reads'].values[0] * 2
-            count_index[sample_name] = {'sample_counts': int(sample_counts)}
-
-        col_sample_counts: list = list()
-        for i in df.index:
-            sample_name = df.loc[i]['sample_name']
-            sample_counts = count_index[sample_name]['sample_counts']
-            col_sample_counts.append(sample_counts)
+        df = self.df_merged
+
+        # NOTE: The src_end_pair_reads values are already merged for a
+        # sample's read-end, since the source counts are on the merged
+        # FASTQ read-end file. Therefore a sample_counts value is double
+        # a given src_end_pair_reads value for a sample.
+        dfg = df.groupby(['sample_name', 'read_number'], observed=True)
+        if (dfg['src_end_pair_reads'].nunique() > 1).any():
+            raise ValueError('Source end pair counts should be equal '
+                             'for all same-end entries.')
+        sample_counts = dfg['src_end_pair_reads'].first().groupby(
+            level='sample_name', observed=True
+        ).last() * 2
+
+        col_sample_counts = df['sample_name'].map(sample_counts).astype(
+            'int64'
+        )
 
         if len(col_sample_counts) != len(self.df_merged.index):
             raise ValueError(
@@ -293,28 +330,30 @@ class ReadCountsSource():
 
         self.df_merged['src_sample_reads'] = col_sample_counts
 
-        dfg = self.df_merged.groupby('revised_sample_name')
-        for sample_name in dfg.groups:
-            dfi = dfg.get_group(sample_name)
-            dfg_r1_fastq = dfi.groupby('read_number').get_group(1)
-            r1_sample_counts = list(set(dfg_r1_fastq['src_sample_reads']))[0]
-            r1_ep_counts = list(set(dfg_r1_fastq['src_end_pair_reads']))[0]
-            dfg_r2_fastq = dfi.groupby('read_number').get_group(2)
-            r2_sample_counts = list(set(dfg_r2_fastq['src_sample_reads']))[0]
-            r2_ep_counts = list(set(dfg_r2_fastq['src_end_pair_reads']))[0]
-            if r1_sample_counts != r2_sample_counts:
-                raise ValueError(
-                    'Source sample counts do not match for R1 & R2.',
-                    sample_name,
-                    f'R1={r1_sample_counts}',
-                    f'R2={r2_sample_counts}'
-                )
-            if r1_ep_counts != r2_ep_counts:
+        df_counts = self.df_merged.pivot_table(
+            index='revised_sample_name',
+            columns='read_number',
+            values=['src_sample_reads', 'src_end_pair_reads'],
+            aggfunc='first',
+            observed=True
+        )
+        count_checks = (
+            ('src_sample_reads',
+             'Source sample counts do not match for R1 & R2.'),
+            ('src_end_pair_reads',
+             'Source end pair counts do not match for R1 & R2.')
+        )
+        for col, message in count_checks:
+            r1_counts = df_counts[(col, 1)]
+            r2_counts = df_counts[(col, 2)]
+            is_diff = r1_counts != r2_counts
+            if is_diff.any():
+                sample_name = is_diff.idxmax()
                 raise ValueError(
-                    'Source end pair counts do not match for R1 & R2.',
+                    message,
                     sample_name,
-                    f'R1={r1_ep_counts}',
-                    f'R2={r2_ep_counts}'
+                    f'R1={r1_counts[sample_name]}',
+                    f'R2={r2_counts[sample_name]}'
                 )
         return
 
@@ -370,51 +409,24 @@ class ReadCountsSource():
         Return
         ------
         """
-        df = self.df_merged.copy()
-        dfg = df.groupby('revised_sample_name')
-        col_sample_name: list = list()
-        col_r1_counts: list = list()
-        col_r2_counts: list = list()
-        col_sample_counts: list = list()
-        col_target_min_perct: list = list()
-        col_samplemap_path: list = list()
-        target_cols: dict = dict()
-
-        for i, sample_name in enumerate(dfg.groups):
-            col_sample_name.append(sample_name)
-            col_target_min_perct.append(self.target_min_perct)
-            dfi = dfg.get_group(sample_name)
-            samplemap_path = list(set(dfi['samplemap_path']))[0]
-            col_samplemap_path.append(samplemap_path)
-            sample_counts = list(set(dfi['src_sample_reads']))[0]
-            col_sample_counts.append(sample_counts)
-            dfg_rn = dfi.groupby('read_number')
-            r1_counts = list(set(
-                dfg_rn.get_group(1)['src_end_pair_reads']
-            ))[0]
-            col_r1_counts.append(r1_counts)
-            r2_counts = list(set(
-                dfg_rn.get_group(2)['src_end_pair_reads']
-            ))[0]
-            col_r2_counts.append(r2_counts)
-            target_cols[i] = {
-                'col_target_counts': list(),
-                'col_perct_of_target': list(),
-                'col_is_pass_perct_target': list()
-            }
-            for target_counts in self.target_counts:
-                target_cols[i]['col_target_counts'].append(target_counts)
-                perct_of_target = round(
-                    ((sample_counts / 2) / target_counts) * 100, 2
-                )
-                target_cols[i]['col_perct_of_target'].append(perct_of_target)
-                if perct_of_target < self.target_min_perct:
-                    is_passed_perct_target = False
-                else:
-                    is_passed_perct_target = True
-                target_cols[i]['col_is_pass_perct_target'].append(
-                    is_passed_perct_target
-                )
+        df = self.df_merged
+        df_samples = df.groupby('revised_sample_name', observed=True)[
+            ['samplemap_path', 'src_sample_reads']
+        ].first().join(
+            df.pivot_table(
+                index='revised_sample_name',
+                columns='read_number',
+                values='src_end_pair_reads',
+                aggfunc='first',
+                observed=True
+            )
+        )
+        col_sample_name = df_samples.index.tolist()
+        col_samplemap_path = df_samples['samplemap_path'].tolist()
+        col_sample_counts = df_samples['src_sample_reads'].tolist()
+        col_r1_counts = df_samples[1].tolist()
+        col_r2_counts = df_samples[2].tolist()
+        col_target_min_perct = [self.target_min_perct] * len(col_sample_name)
 
         if (col_r1_counts == col_r2_counts) is False:
             raise ValueError('Read counts differ for R1 and R2 columns.')
@@ -435,67 +447,35 @@ class ReadCountsSource():
             'sample_counts': col_sample_counts
         })
         df_tmp['sum'] = df_tmp['r1_counts'] + df_tmp['r2_counts']
-        if list(df_tmp['sample_counts']) == list(df_tmp['sum']) is False:
+        if list(df_tmp['sample_counts']) != list(df_tmp['sum']):
             raise ValueError(
                 'R1 and R2 read count sum differ froms sample count.'
             )
 
-        df_seqcov = pd.DataFrame()
-        df_seqcov['sample_name'] = col_sample_name
-        df_seqcov['samplemap_path'] = col_samplemap_path
-        df_seqcov['r1_read_counts'] = col_r1_counts
-        df_seqcov['r2_read_counts'] = col_r2_counts
-        df_seqcov['sample_read_counts'] = col_sample_counts
-        df_seqcov['min_target_perct_cov'] = col_target_min_perct
-
-        collection: dict = dict()
-        for i, target_count in enumerate(target_cols[0]['col_target_counts']):
-            # We may use the first entry to setup the target labels for
-            # all of the entries in the collection.
-            collection[i] = {
-                'perct_label': f'perct_of_{target_count}',
-                'col_perct_of_target': list(),
-                'is_passed_label': f'is_passed_{target_count}',
-                'is_pass_perct_target': list()
-            }
-
-        for i in sorted(collection.keys()):
-            for sample_i in sorted(target_cols):
-                perct = target_cols[sample_i]['col_perct_of_target'][i]
-                is_pass = target_cols[sample_i]['col_is_pass_perct_target'][i]
-                collection[i]['col_perct_of_target'].append(perct)
-                collection[i]['is_pass_perct_target'].append(is_pass)
-
-        for i in sorted(collection):
-            perct_label = collection[i]['perct_label']
-            is_passed_label = collection[i]['is_passed_label']
-            df_seqcov[perct_label] = collection[i]['col_perct_of_target']
-            df_seqcov[is_passed_label] = collection[i]['is_pass_perct_target']
+        # Percent of each target (columns) for each sample (rows).
+        perct_of_target, is_passed_perct_target = calc_perct_of_target(
+            sample_counts=col_sample_counts,
+            target_counts=self.target_counts,
+            target_min_perct=self.target_min_perct
+        )
+
+        seqcov_cols: dict = {
+            'sample_name': col_sample_name,
+            'samplemap_path': col_samplemap_path,
+            'r1_read_counts': col_r1_counts,
+            'r2_read_counts': col_r2_counts,
+            'sample_read_counts': col_sample_counts,
+            'min_target_perct_cov': col_target_min_perct
+        }
+        for i, perct_label in enumerate(self.target_perct_labels):
+            is_passed_label = self.target_is_passed_labels[i]
+            seqcov_cols[perct_label] = perct_of_target[:, i]
+            seqcov_cols[is_passed_label] = is_passed_perct_target[:, i]
+        df_seqcov = pd.DataFrame(seqcov_cols)
 
         self.df_src_seqcov = df_seqcov
         return
 
-    def __calc_file_md5(self: Self, file_path: str) -> str:
-        """Returns the MD5 hash for a specified file.
-
-        Parameters
-        ----------
-        file_path : str
-            A qualified file path for which to calculate the MD5 hash.
-
-        Raises
-        ------
-        None
-
-        Returns
-        -------
-        None
-        """
-        with open(file_path, 'rb') as fh:
-            data = fh.read()
-            md5sum = hashlib.md5(data).hexdigest()
-        return md5sum
-
     def __write_src_counts_df(self: Self, file_path: str) -> None:
         """Write the source read count dataframe to a tab-delimited file.
 
@@ -512,8 +492,9 @@ class ReadCountsSource():
         -------
         None
         """
-        self.df_src_seqcov.to_csv(file_path, sep='\t', index=False)
-        md5 = self.__calc_file_md5(file_path=file_path)
+        with Md5Writer(file_path=file_path) as fho:
+            self.df_src_seqcov.to_csv(fho, sep='\t', index=False)
+        md5 = fho.hexdigest()
         md5_path = file_path + '.MD5'
         with open(md5_path, 'w') as fh:
             fh.write(f'MD5 ({file_path}) = {md5}\n')
@@ -536,8 +517,9 @@ class ReadCountsSource():
         -------
         None
         """
-        self.df_comp.to_csv(file_path, sep='\t', index=False)
-        md5 = self.__calc_file_md5(file_path=file_path)
+        with Md5Writer(file_path=file_path) as fho:
+            self.df_comp.to_csv(fho, sep='\t', index=False)
+        md5 = fho.hexdigest()
         md5_path = file_path + '.MD5'
         with open(md5_path, 'w') as fh:
             fh.write(f'MD5 ({file_path}) = {md5}\n')
@@ -566,7 +548,24 @@ class ReadCountsSource():
                 self.gtac_counts
             )
         else:
-            self.df_gtac_counts = pd.read_csv(self.gtac_counts, sep='\t')
+            # Only the read count columns take part in the comparison.
+            self.df_gtac_counts = pd.read_csv(
+                self.gtac_counts,
+                sep='\t',
+                usecols=[
+                    'sample_name',
+                    'r1_read_counts',
+                    'r2_read_counts',
+                    'sample_read_counts'
+                ],
+                dtype={
+                    'sample_name': str,
+                    'r1_read_counts': 'int64',
+                    'r2_read_counts': 'int64',
+                    'sample_read_counts': 'int64'
+                },
+                engine='c'
+            )
         return
 
     def __compare_gtac_to_src_counts(self: Self) -> None:
@@ -606,51 +605,32 @@ class ReadCountsSource():
         -------
         None
         """
-        df_src = self.df_src_seqcov.copy()
-        df_gtac = self.df_gtac_counts.copy()
-        df_eval = df_src == df_gtac
-        col_sample_names: list = list()
-        col_r1_read_counts: list = list()
-        col_r2_read_counts: list = list()
-        col_sample_read_counts: list = list()
-
-        for i in df_eval.index:
-            sample_name = df_gtac.loc[i]['sample_name']
-            col_sample_names.append(sample_name)
-            gtac_counts = df_gtac.loc[i]['r1_read_counts']
-            src_counts = df_src.loc[i]['r1_read_counts']
-            r1_comp = f'{gtac_counts}:{src_counts}'
-            col_r1_read_counts.append(r1_comp)
-            gtac_counts = df_gtac.loc[i]['r2_read_counts']
-            src_counts = df_src.loc[i]['r2_read_counts']
-            r2_comp = f'{gtac_counts}:{src_counts}'
-            col_r2_read_counts.append(r2_comp)
-            gtac_counts = df_gtac.loc[i]['sample_read_counts']
-            src_counts = df_src.loc[i]['sample_read_counts']
-            r2_comp = f'{gtac_counts}:{src_counts}'
-            col_sample_read_counts.append(r2_comp)
+        count_cols = ['r1_read_counts', 'r2_read_counts', 'sample_read_counts']
+        df_src = self.df_src_seqcov
+        df_gtac = self.df_gtac_counts
+        col_sample_names = df_gtac['sample_name'].tolist()
+        col_r1_read_counts, col_r2_read_counts, col_sample_read_counts = [
+            (
+                df_gtac[count_col].astype(str) + ':'
+                + df_src[count_col].astype(str)
+            ).tolist()
+            for count_col in count_cols
+        ]
         self.df_comp['sample_name'] = col_sample_names
         self.df_comp['r1_read_counts_gtac_src'] = col_r1_read_counts
         self.df_comp['r2_read_counts_gtac_src'] = col_r2_read_counts
         self.df_comp['sample_read_counts_gtac_src'] = col_sample_read_counts
 
+        # GTAC and source counts usually match exactly, so check the
+        # whole block at once before falling back to a per-row check.
         col_bool: list = list()
-        for i in df_eval.index:
-            dfi = df_eval.loc[i][[
-                'r1_read_counts',
-                'r2_read_counts',
-                'sample_read_counts'
-            ]]
-            is_all_true = bool(dfi.all())
-            col_bool.append(is_all_true)
+        if df_src[count_cols].equals(df_gtac[count_cols]) is True:
+            col_bool = [True] * len(df_src)
+        else:
+            df_eval = df_src[count_cols] == df_gtac[count_cols]
+            col_bool = df_eval.all(axis=1).tolist()
 
-        if (
-                len(col_sample_names) ==
-                len(col_r1_read_counts) ==
-                len(col_r2_read_counts) ==
-                len(col_sample_read_counts) ==
-                len(col_bool)
-        ) is False:
+        if len(self.df_comp) != len(col_bool):
             raise ValueError('Read count columns vary in length.')
         else:
             self.df_comp['is_no_difference'] = col_bool
@@ -675,7 +655,7 @@ class ReadCountsSource():
         -------
         None
         """
-        df = self.df_comp.copy()
+        df = self.df_comp
         if bool(df['is_no_difference'].all()) is True:
             print('\nFINISHED:')
             print('There are no differences between the GTAC and '
@@ -683,15 +663,12 @@ class ReadCountsSource():
             print('\nOUTPUT:')
             print(f'{self.report_path}\n')
         else:
-            dfg = df.groupby('is_no_difference')
-            dfg_false = dfg.get_group(False)
+            sample_names = df.loc[~df['is_no_difference'], 'sample_name']
             print('\nFINISHED:')
             print('Differences detected between the GTAC and source read '
                   'counts.\n')
             print('Investigate the following sample names:\n')
-            for i in dfg_false.index:
-                sample_name = dfg_false.loc[i]['sample_name']
-                print(sample_name)
+            print('\n'.join(sample_names.tolist()))
             print('\nOUTPUT:')
             print(f'{self.report_path}\n')
         return
@@ -11,6 +11,7 @@ import pandas as pd  # type: ignore
 from typing_extensions import Self
 from pandas import DataFrame  # type: ignore
 from pathlib import Path
+import shutil
 
 
 class RenameSamples:
@@ -98,9 +99,6 @@ class RenameSamples:
         ValueError
             The revised_sample_id column values are not unique.
 
-        ValueError
-            Samplemap to revised id is not one-to-one.
-
         Returns
         -------
         None
@@ -120,33 +118,13 @@ class RenameSamples:
                 len(self.df.values)
             )
 
-        samplemap_sample_id_count = len(self.df['samplemap_sample_id'].values)
-        samplemap_sample_id_ucount = len(
-            set(self.df['samplemap_sample_id'].values)
-        )
-        if samplemap_sample_id_count != samplemap_sample_id_ucount:
+        if self.df['samplemap_sample_id'].is_unique is False:
             raise ValueError('The samplemap_sample_id column values '
                              'are not unique.')
 
-        revised_sample_id_count = len(self.df['revised_sample_id'].values)
-        revised_sample_id_ucount = len(
-            set(self.df['revised_sample_id'].values)
-        )
-        if revised_sample_id_count != revised_sample_id_ucount:
+        if self.df['revised_sample_id'].is_unique is False:
             raise ValueError('The revised_sample_id column values '
                              'are not unique.')
-
-        dfg = self.df.groupby('samplemap_sample_id')
-        for sample_id in dfg.groups:
-            sample_id_count = len(dfg.get_group(sample_id))
-            if sample_id_count > 1:
-                raise ValueError('Samplemap to revised id is not one-to-one.')
-
-        dfg = self.df.groupby('revised_sample_id')
-        for sample_id in dfg.groups:
-            sample_id_count = len(dfg.get_group(sample_id))
-            if sample_id_count > 1:
-                raise ValueError('Samplemap to revised id is not one-to-one.')
         return
 
     def copy_df(self: Self) -> DataFrame:
@@ -192,7 +170,7 @@ class RenameSamples:
         else:
             src = Path(self.args.rename)
             dest = Path(outdir) / 'rename.tsv'
-            dest.write_text(src.read_text())
+            shutil.copyfile(src, dest)
         return
 
 # __END__
@@ -7,13 +7,103 @@
 # Copyright   : Copyright (C) 2024 by T.N. Wylie. All rights reserved.
 
 import argparse
+import csv
+import os
 import pandas as pd  # type: ignore
 from pandas import DataFrame  # type: ignore
 from . rename_samples import RenameSamples  # type: ignore
+from . md5_writer import Md5Writer  # type: ignore
+from . file_listing import files_exist  # type: ignore
 from typing_extensions import Self
 from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 import re
-import hashlib
+
+
+# FASTQ file names from GTAC@MGI carry a read-pair number tag such as
+# '_R1_' or '_R2.' somewhere in the name.
+READ_NUM_TAG_PATTERN = re.compile(r'(_R[12]_|_R[12].)', re.IGNORECASE)
+
+# The full set of columns for each known Samplemap format type. Column
+# order is irrelevant.
+SMAP_MID_2024_FORMAT = frozenset({
+    'FASTQ',
+    'Flowcell ID',
+    'Index Sequence',
+    'Flowcell Lane',
+    'ESP ID',
+    'Pool Name',
+    'Species',
+    'Illumina Sample Type',
+    'Library Type',
+    'Library Name',
+    'Date Complete',
+    'Total Reads',
+    'Total Bases',
+    'PhiX Error Rate',
+    '% Pass Filter Clusters',
+    '% >Q30',
+    'Avg Q Score'
+})
+
+# The Samplemap columns used for each format type. Other columns are
+# skipped when the Samplemap file is read.
+SMAP_USECOLS = {
+    'smap_mid_2024_format': (
+        'FASTQ',
+        'Flowcell ID',
+        'Index Sequence',
+        'Flowcell Lane',
+        'ESP ID',
+        'Pool Name',
+        'Library Type',
+        'Library Name',
+        'Total Reads',
+        'Total Bases'
+    )
+}
+
+# Samplemap columns with few unique values relative to the number of
+# FASTQ files. These are stored as categoricals once the batches are
+# concatenated. Sample names are left as strings, as they are mapped to
+# revised names and merge commands downstream.
+CATEGORY_COLS = (
+    'flow_cell_id',
+    'index_sequence',
+    'library_type',
+    'pool_name',
+    'samplemap_path'
+)
+
+
+@dataclass(slots=True)
+class SamplemapBatch:
+    """A parsed Samplemap.csv file and its batch metadata.
+
+    Attributes
+    ----------
+    batch_id : int
+        Samplemap "batch" number/order from the command line arguments.
+
+    samplemap_type : str
+        The identified Samplemap format type.
+
+    samplemap_path : str
+        A qualified path to the Samplemap.csv file.
+
+    fastq_dir : str
+        The directory holding the batch's FASTQ files.
+
+    df : DataFrame
+        A formatted Samplemap dataframe for the batch.
+    """
+
+    batch_id: int
+    samplemap_type: str
+    samplemap_path: str
+    fastq_dir: str
+    df: DataFrame
 
 
 class Samplemap:
@@ -50,11 +140,10 @@ class Samplemap:
         A list of paths to the original Samplemap.csv files supplied by
         the user.
 
-    smaps : dict
-        A dictionary of the individual samplemap dataframes and
-        corresponding metadata ('samplemap_type', 'samplemap_path',
-        'fastq_dir', 'df'). These are the representations prior to
-        concatenation.
+    smaps : list
+        A list of SamplemapBatch objects holding the individual
+        samplemap dataframes and corresponding metadata, in batch
+        order. These are the representations prior to concatenation.
 
     unique_sample_names_file : str
         A file of unique (original) sorted sample names.
@@ -98,7 +187,7 @@ class Samplemap:
         """
         self.args = args
         self.rename = rename
-        self.smaps: dict = dict()
+        self.smaps: list = list()
         self.smap_paths: list = list()
         self.df_smaps: DataFrame = DataFrame()
         self.sample_names_file: str = str()
@@ -161,20 +250,13 @@ class Samplemap:
             A defined format type for a given Samplemap file.
         """
         # The order of the columns is irrelevant as long as all fields
-        # are present in the Samplemap.csv file.
-
-        df = pd.read_csv(smap)
-        cols = set(df.columns)
+        # are present in the Samplemap.csv file. Only the header row is
+        # needed to type the file.
 
-        smap_mid_2024_format = {'FASTQ', 'Flowcell ID', 'Index Sequence',
-                                'Flowcell Lane', 'ESP ID', 'Pool Name',
-                                'Species', 'Illumina Sample Type',
-                                'Library Type', 'Library Name',
-                                'Date Complete', 'Total Reads', 'Total Bases',
-                                'PhiX Error Rate', '% Pass Filter Clusters',
-                                '% >Q30', 'Avg Q Score'}
+        with open(smap, newline='', encoding='utf-8-sig') as fh:
+            cols = frozenset(next(csv.reader(fh), []))
 
-        if cols == smap_mid_2024_format:
+        if cols == SMAP_MID_2024_FORMAT:
             smap_type = 'smap_mid_2024_format'
         else:
             raise TypeError(
@@ -183,7 +265,31 @@ class Samplemap:
             )
         return smap_type
 
-    def __smap_mid_2024_to_df(self: Self, smap: str) -> DataFrame:
+    def __parse_count_col(self: Self, col: pd.Series) -> pd.Series:
+        """Return a comma-grouped Samplemap count column as integers.
+
+        GTAC@MGI writes counts such as Total Reads as '75,191,910'. We
+        strip the commas and cast the column to a nullable integer type
+        in one pass, so large counts never round-trip through float64.
+
+        Parameters
+        ----------
+        col : Series
+            A Samplemap count column, read as strings.
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        Series
+            Returns the count column as Int64 values.
+        """
+        return col.str.replace(',', '', regex=False).astype('Int64')
+
+    def __smap_mid_2024_to_df(self: Self, smap: str,
+                              df_smap: DataFrame) -> DataFrame:
         """Return dataframe of Samplemap information.
 
         We only require a uniform, subset of Samplemap values for FASTQ
@@ -260,7 +366,11 @@ class Samplemap:
         Parameters
         ----------
         smap : str
-            A qualified path to a Samplemap.csv file.
+            A resolved path to a Samplemap.csv file.
+
+        df_smap : DataFrame
+            A dataframe of the Samplemap.csv file, as parsed by
+            __read_samplemap().
 
         Raises
         ------
@@ -270,111 +380,51 @@ class Samplemap:
         ValueError
             Read-pair number tag is None.
 
-        ValueError
-            Dataframe field row lengths not of equal length
-
         Returns
         -------
         DataFrame
             Returns a formatted Samplemap dataframe.
         """
-        (file_name_col,
-         flow_cell_id_col,
-         index_sequence_col,
-         lane_number_col,
-         read_number_col,
-         sample_name_col,
-         library_type_col,
-         total_bases_col,
-         samplemap_path_col,
-         total_reads_col,
-         esp_id_col,
-         pool_name_col) = (list() for i in range(12))
-
-        df = pd.read_csv(smap, thousands=',')
-        for i in df.index:
-            df_i = df.loc[i]
-            fastq = df_i['FASTQ']
-            flow_cell_id = df_i['Flowcell ID']
-            index_sequence = df_i['Index Sequence']
-            lane_number = df_i['Flowcell Lane']
-            sample_name = df_i['Library Name']
-            library_type = df_i['Library Type']
-            total_bases = df_i['Total Bases']
-            samplemap_path = smap
-            total_reads = df_i['Total Reads']
-            esp_id = df_i['ESP ID']
-            pool_name = df_i['Pool Name']
-            pattern = r'_R[12]_|_R[12].'
-            read_num_tag = re.search(pattern, df_i['FASTQ'], re.IGNORECASE)
-            if read_num_tag is not None:
-                match read_num_tag.group():
-                    case '_R1_' | '_R1.':
-                        read_number = 1
-                    case '_R2_' | '_R2.':
-                        read_number = 2
-                    case _:
-                        raise ValueError(
-                            'Read-pair number tag is not R1 or R2.',
-                            read_num_tag
-                        )
-            else:
+        read_num_tags = df_smap['FASTQ'].str.extract(
+            READ_NUM_TAG_PATTERN, expand=False
+        )
+        read_numbers = read_num_tags.map(
+            {'_R1_': 1, '_R1.': 1, '_R2_': 2, '_R2.': 2}
+        )
+        is_bad_tag = read_numbers.isna()
+        if bool(is_bad_tag.any()) is True:
+            read_num_tag = read_num_tags[is_bad_tag].iloc[0]
+            if pd.isna(read_num_tag) is True:
                 raise ValueError(
                     'Read-pair number tag is None.',
+                    None
+                )
+            else:
+                raise ValueError(
+                    'Read-pair number tag is not R1 or R2.',
                     read_num_tag
                 )
 
-            file_name_col.append(fastq)
-            flow_cell_id_col.append(flow_cell_id)
-            index_sequence_col.append(index_sequence)
-            lane_number_col.append(lane_number)
-            read_number_col.append(read_number)
-            sample_name_col.append(sample_name)
-            library_type_col.append(library_type)
-            total_bases_col.append(total_bases)
-            samplemap_path_col.append(
-                str(Path(samplemap_path).resolve())
-            )
-            total_reads_col.append(total_reads)
-            esp_id_col.append(esp_id)
-            pool_name_col.append(pool_name)
-
-        field_lengths: set = set()
-        field_lengths.add(len(file_name_col))
-        field_lengths.add(len(flow_cell_id_col))
-        field_lengths.add(len(index_sequence_col))
-        field_lengths.add(len(lane_number_col))
-        field_lengths.add(len(read_number_col))
-        field_lengths.add(len(sample_name_col))
-        field_lengths.add(len(library_type_col))
-        field_lengths.add(len(total_bases_col))
-        field_lengths.add(len(samplemap_path_col))
-        field_lengths.add(len(total_reads_col))
-        field_lengths.add(len(esp_id_col))
-        field_lengths.add(len(pool_name_col))
-        if len(field_lengths) > 1:
-            raise ValueError(
-                'Dataframe field row lengths not of equal length.',
-                field_lengths
-            )
-
-        df_subset = DataFrame()
-        df_subset['fastq'] = file_name_col
-        df_subset['flow_cell_id'] = flow_cell_id_col
-        df_subset['index_sequence'] = index_sequence_col
-        df_subset['lane_number'] = lane_number_col
-        df_subset['read_number'] = read_number_col
-        df_subset['sample_name'] = sample_name_col
-        df_subset['library_type'] = library_type_col
-        df_subset['total_bases'] = total_bases_col
-        df_subset['samplemap_path'] = samplemap_path_col
-        df_subset['gtac_fastq_reads'] = total_reads_col
-        df_subset['esp_id'] = esp_id_col
-        df_subset['pool_name'] = pool_name_col
+        df_subset = DataFrame({
+            'fastq': df_smap['FASTQ'].to_numpy(),
+            'flow_cell_id': df_smap['Flowcell ID'].to_numpy(),
+            'index_sequence': df_smap['Index Sequence'].to_numpy(),
+            'lane_number': df_smap['Flowcell Lane'].to_numpy(),
+            'read_number': read_numbers.astype('int64').to_numpy(),
+            'sample_name': df_smap['Library Name'].to_numpy(),
+            'library_type': df_smap['Library Type'].to_numpy(),
+            'total_bases': self.__parse_count_col(df_smap['Total Bases']),
+            'samplemap_path': smap,
+            'gtac_fastq_reads': self.__parse_count_col(
+                df_smap['Total Reads']
+            ),
+            'esp_id': df_smap['ESP ID'].to_numpy(),
+            'pool_name': df_smap['Pool Name'].to_numpy()
+        })
         return df_subset
 
-    def __parse_samplemap(self: Self, i: int, smap: str,
-                          smap_type: str) -> None:
+    def __parse_samplemap(self: Self, i: int, smap: str, smap_type: str,
+                          df_smap: DataFrame) -> None:
         """Parse a Samplemap file and add to the object instance.
 
         We will parse a given Samplemap.csv file and convert the
@@ -396,6 +446,10 @@ class Samplemap:
             The identified Samplemap format type, as determined by the
             __type_samplemap_format() method.
 
+        df_smap : DataFrame
+            A dataframe of the Samplemap.csv file, as parsed by
+            __read_samplemap().
+
         Raises
         ------
         TypeError
@@ -406,24 +460,28 @@ class Samplemap:
         None
         """
         if smap_type == 'smap_mid_2024_format':
-            df_subset = self.__smap_mid_2024_to_df(smap=smap)
+            smap_path = Path(smap)
+            samplemap_path = str(smap_path.resolve())
+            fastq_dir = str(smap_path.parent)
+            df_subset = self.__smap_mid_2024_to_df(
+                smap=samplemap_path,
+                df_smap=df_smap
+            )
             df_subset['batch_id'] = i
-            fastq_dir = str(Path(smap).parent)
-            fastq_path_col: list = list()
-            for ii in df_subset.index:
-                fastq = df_subset.loc[ii]['fastq']
-                fastq_path = Path(fastq_dir) / Path(fastq)
-                fastq_path_col.append(str(fastq_path.resolve()))
-            df_subset['fastq_path'] = fastq_path_col
-            self.smaps.update({
-                i: {
-                    'samplemap_type': smap_type,
-                    'samplemap_path': str(Path(smap).resolve()),
-                    'fastq_dir': fastq_dir,
-                    'df': df_subset,
-                }
-            })
-            self.smap_paths.append(str(Path(smap).resolve()))
+            # Path.resolve() is os.path.realpath() underneath; calling it
+            # directly spares building two Path objects per FASTQ file.
+            df_subset['fastq_path'] = [
+                os.path.realpath(os.path.join(fastq_dir, fastq))
+                for fastq in df_subset['fastq'].tolist()
+            ]
+            self.smaps.append(SamplemapBatch(
+                batch_id=i,
+                samplemap_type=smap_type,
+                samplemap_path=samplemap_path,
+                fastq_dir=fastq_dir,
+                df=df_subset
+            ))
+            self.smap_paths.append(samplemap_path)
         else:
             raise TypeError(
                 'Unknown samplemap format type encountered.',
@@ -448,7 +506,7 @@ class Samplemap:
         -------
         None
         """
-        df = self.df_smaps.copy()
+        df = self.df_smaps
         dfg = df.groupby('sample_name')
         sample_ids = set(dfg.groups.keys())
         for sample_id in sample_ids:
@@ -481,19 +539,17 @@ class Samplemap:
         -------
         None
         """
-        df = self.df_smaps.copy()
-        dfg = df.groupby('sample_name')
-        sample_ids = set(dfg.groups.keys())
-        for sample_id in sample_ids:
-            df_sample = dfg.get_group(sample_id)
-            batch_set = set(df_sample['batch_id'])
-            batch_count = len(batch_set)
-            if batch_count > 1:
-                raise ValueError(
-                    'Sample exists across multiple batches.',
-                    sample_id,
-                    batch_set
-                )
+        df = self.df_smaps
+        batch_counts = df.groupby('sample_name')['batch_id'].nunique()
+        cross_batch_counts = batch_counts[batch_counts > 1]
+        if cross_batch_counts.empty is False:
+            sample_id = cross_batch_counts.index[0]
+            batch_set = set(df.loc[df['sample_name'] == sample_id, 'batch_id'])
+            raise ValueError(
+                'Sample exists across multiple batches.',
+                sample_id,
+                batch_set
+            )
         return
 
     def __concatenate_samplemaps(self: Self) -> None:
@@ -515,13 +571,46 @@ class Samplemap:
         -------
         None
         """
-        dfs: list = list()
-        for i in sorted(self.smaps.keys()):
-            dfs.append(self.smaps[i]['df'])
-        self.df_smaps = pd.concat(dfs).reset_index(drop=True)
+        dfs = [smap_batch.df for smap_batch in self.smaps]
+        self.df_smaps = pd.concat(dfs, ignore_index=True)
+        self.df_smaps = self.df_smaps.astype(
+            {col: 'category' for col in CATEGORY_COLS}
+        )
         self.df_smaps['project'] = self.args.project
         return
 
+    def __read_samplemap(self: Self, smap: str,
+                         smap_type: str) -> DataFrame:
+        """Return a dataframe of a Samplemap.csv file.
+
+        Only the columns used for the Samplemap format type are
+        parsed--see SMAP_USECOLS.
+
+        Parameters
+        ----------
+        smap : str
+            A qualified path to a Samplemap.csv file.
+
+        smap_type : str
+            The identified Samplemap format type, as determined by the
+            __type_samplemap_format() method.
+
+        Raises
+        ------
+        None
+
+        Returns
+        -------
+        DataFrame
+            Returns the Samplemap file as read by read_csv(). Count
+            columns are kept as strings--see __parse_count_col().
+        """
+        return pd.read_csv(
+            smap,
+            usecols=list(SMAP_USECOLS[smap_type]),
+            dtype={'Total Reads': str, 'Total Bases': str}
+        )
+
     def __parse_samplemaps(self: Self) -> None:
         """Parse all of the input Samplemap files.
 
@@ -541,9 +630,28 @@ class Samplemap:
         -------
         None
         """
-        for i, smap in enumerate(self.args.samplemap, 1):
-            smap_type = self.__type_samplemap_format(smap=smap)
-            self.__parse_samplemap(i=i, smap=smap, smap_type=smap_type)
+        # Each Samplemap.csv file is typed from its header and then read
+        # once. The reads are overlapped across threads; results are
+        # returned in command line order.
+        smaps = self.args.samplemap
+        smap_types = [
+            self.__type_samplemap_format(smap=smap) for smap in smaps
+        ]
+        max_workers = max(1, min(32, len(smaps)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            smap_dfs = list(
+                executor.map(self.__read_samplemap, smaps, smap_types)
+            )
+
+        for i, (smap, smap_type, df_smap) in enumerate(
+            zip(smaps, smap_types, smap_dfs), 1
+        ):
+            self.__parse_samplemap(
+                i=i,
+                smap=smap,
+                smap_type=smap_type,
+                df_smap=df_smap
+            )
         self.__concatenate_samplemaps()
         self.__eval_cross_batch_sample_ids()
         self.__eval_whitespace()
@@ -555,7 +663,7 @@ class Samplemap:
         We will evaluate all origin FASTQ file paths to make sure that
         the source files are on-disk and accessible. This evaluation
         will pass if either (1) the compressed FASTQ or (2) decompressed
-        FASTQ version is accessible on-disk.
+        FASTQ version is accessible on-disk; see files_exist().
 
         Parameters
         ----------
@@ -570,26 +678,25 @@ class Samplemap:
         -------
         None
         """
-        for batch_i in self.smaps:
-            df = self.smaps[batch_i]['df'].copy()
-            fastq_dir = self.smaps[batch_i]['fastq_dir']
-            for i in df.index:
-                fastq = df.loc[i]['fastq']
-                origin_fastq_gz_path = Path(fastq_dir) / Path(fastq)
-                re_suffix = re.search('.gz$', str(origin_fastq_gz_path))
-                if re_suffix is None:
-                    origin_fastq_gz_path = Path(
-                        str(origin_fastq_gz_path) + '.gz'
-                    )
-                origin_fastq_path = Path(str(origin_fastq_gz_path)[:-3])
-                if (
-                    origin_fastq_path.is_file() is False and
-                    origin_fastq_gz_path.is_file() is False
-                ):
-                    raise FileNotFoundError(
-                        'Original FASTQ file is not found.',
-                        fastq
-                    )
+        fastqs: list = list()
+        origin_fastq_gz_paths: list = list()
+        for smap_batch in self.smaps:
+            fastq_dir = smap_batch.fastq_dir
+            for fastq in smap_batch.df['fastq'].tolist():
+                origin_fastq_gz_path = os.path.join(fastq_dir, fastq)
+                if origin_fastq_gz_path.endswith('.gz') is False:
+                    origin_fastq_gz_path += '.gz'
+                fastqs.append(fastq)
+                origin_fastq_gz_paths.append(origin_fastq_gz_path)
+        is_fastq_found = files_exist(
+            file_paths=[(path, path[:-3]) for path in origin_fastq_gz_paths]
+        )
+        for fastq, is_found in zip(fastqs, is_fastq_found):
+            if is_found is False:
+                raise FileNotFoundError(
+                    'Original FASTQ file is not found.',
+                    fastq
+                )
         return
 
     def __eval_compare_sample_ids(self: Self) -> None:
@@ -614,7 +721,7 @@ class Samplemap:
         -------
         None
         """
-        df_rename = self.rename.copy_df()
+        df_rename = self.rename.df
         rename_sample_ids = set(df_rename['samplemap_sample_id'])
         smap_sample_ids = set(self.df_smaps['sample_name'])
         if smap_sample_ids != rename_sample_ids:
@@ -641,42 +748,17 @@ class Samplemap:
         -------
         None
         """
-        df = self.df_smaps.copy()
-        dfg = df.groupby('sample_name')
-        for sample_name in dfg.groups:
-            tag_count = len(
-                dfg.get_group(sample_name)['index_sequence'].unique()
+        tag_counts = self.df_smaps.groupby('sample_name')[
+            'index_sequence'
+        ].nunique(dropna=False)
+        bad_tag_counts = tag_counts[tag_counts != 1]
+        if bad_tag_counts.empty is False:
+            raise ValueError(
+                'Bad sample id to sequence index cardinality.',
+                bad_tag_counts.index[0]
             )
-            if tag_count != 1:
-                raise ValueError(
-                    'Bad sample id to sequence index cardinality.',
-                    sample_name
-                )
         return
 
-    def __calc_file_md5(self: Self, file_path: str) -> str:
-        """Returns the MD5 hash for a specified file.
-
-        Parameters
-        ----------
-        file_path : str
-            A qualified path to the file to receive a MD5 hash.
-
-        Raises
-        ------
-        None
-
-        Returns
-        -------
-        str
-            Returns the MD5 hash value associated with the supplied
-            file.
-        """
-        with open(file_path, 'rb') as fh:
-            data = fh.read()
-            md5sum = hashlib.md5(data).hexdigest()
-        return md5sum
-
     def __add_rename_ids_to_df(self: Self) -> None:
         """Rename Samplemap ids based on RenameSamples ids.
 
@@ -699,43 +781,33 @@ class Samplemap:
         ValueError
             RenameSamples revised_sample_id is null.
 
-        ValueError
-            Samplemap and RenameSamples sample id counts differ.
-
         Returns
         -------
         None
         """
-        df_rename = self.rename.copy_df()
-        df_smaps = self.df_smaps.copy()
-        dfg = df_rename.groupby('samplemap_sample_id')
-        revised_sample_id_cols: list = list()
-        for i in df_smaps.index:
-            sample_id = df_smaps.loc[i]['sample_name']
-            if sample_id not in dfg.groups.keys():
+        df_rename = self.rename.df
+        rename_lookup = df_rename.set_index('samplemap_sample_id')[
+            'revised_sample_id'
+        ]
+        sample_ids = self.df_smaps['sample_name']
+        is_known_id = sample_ids.isin(rename_lookup.index)
+        revised_sample_ids = sample_ids.map(rename_lookup)
+        is_null_id = revised_sample_ids.isna() | (revised_sample_ids == '')
+        is_bad_id = ~is_known_id | is_null_id
+        if bool(is_bad_id.any()) is True:
+            i = is_bad_id.idxmax()
+            if bool(is_known_id[i]) is False:
                 raise IndexError(
                     'Samplemap samplemap_sample_id is not in the '
                     'RenameSamples index.',
-                    sample_id
+                    sample_ids[i]
                 )
             else:
-                dfg_rev_sample_id = dfg.get_group(sample_id)[
-                    'revised_sample_id'
-                ].item()
-                if (
-                    dfg_rev_sample_id == '' or
-                        pd.isna(dfg_rev_sample_id) is True
-                ):
-                    raise ValueError(
-                        'RenameSamples revised_sample_id is null.',
-                        sample_id
-                    )
-                else:
-                    revised_sample_id_cols.append(dfg_rev_sample_id)
-        if len(revised_sample_id_cols) != len(df_smaps['sample_name']):
-            raise ValueError('Samplemap and RenameSamples '
-                             'sample id counts differ.')
-        self.df_smaps['revised_sample_name'] = revised_sample_id_cols
+                raise ValueError(
+                    'RenameSamples revised_sample_id is null.',
+                    sample_ids[i]
+                )
+        self.df_smaps['revised_sample_name'] = revised_sample_ids
         return
 
     def write_df(self: Self, file_path: str) -> None:
@@ -755,8 +827,9 @@ class Samplemap:
         -------
         None
         """
-        self.df_smaps.to_csv(file_path, sep='\t', index=False)
-        md5 = self.__calc_file_md5(file_path=file_path)
+        with Md5Writer(file_path=file_path) as fho:
+            self.df_smaps.to_csv(fho, sep='\t', index=False)
+        md5 = fho.hexdigest()
         md5_path = file_path + '.MD5'
         with open(md5_path, 'w') as fh:
             fh.write(f'MD5 ({file_path}) = {md5}\n')
@@ -0,0 +1,92 @@
+# Project     : merge_fastq
+# File Name   : target_coverage.py
+# Description : Functions for target sequence throughput calculations.
+# Author      : Todd N. Wylie
+# Email       : twylie@wustl.edu
+# Created     : Thu Oct 15 14:36:52 CDT 2026
+# Copyright   : Copyright (C) 2024 by T.N. Wylie. All rights reserved.
+
+import numpy as np
+
+
+# Target read counts used to evaluate sample sequence throughput, and
+# the matching report column labels. Update TARGET_READ_COUNTS to reduce
+# or expand the number of evaluations.
+TARGET_READ_COUNTS = (
+    100_000,
+    200_000,
+    300_000,
+    400_000,
+    500_000,
+    1_000_000,
+    1_500_000,
+    2_000_000,
+    2_500_000,
+    3_000_000,
+    3_500_000,
+    4_000_000,
+    4_500_000,
+    5_000_000,
+    10_000_000,
+    20_000_000,
+    30_000_000,
+    40_000_000,
+    50_000_000
+)
+TARGET_PERCT_LABELS = tuple(
+    f'perct_of_{target_count}' for target_count in TARGET_READ_COUNTS
+)
+TARGET_IS_PASSED_LABELS = tuple(
+    f'is_passed_{target_count}' for target_count in TARGET_READ_COUNTS
+)
+
+
+def calc_perct_of_target(sample_counts: list, target_counts: tuple,
+                         target_min_perct: int) -> tuple:
+    """Calculate sample sequence throughput against target read counts.
+
+    Essentially:
+
+        percent = ((sample_counts / 2)  / target_counts) * 100
+
+    for every sample (rows) and target read count (columns), rounded to
+    two decimal places.
+
+    Parameters
+    ----------
+    sample_counts : list
+        Read counts, one per sample.
+
+    target_counts : tuple
+        Target read counts to evaluate each sample against.
+
+    target_min_perct : int
+        The minimum percent of target sequence throughput for a sample
+        to pass.
+
+    Raises
+    ------
+    None
+
+    Returns
+    -------
+    tuple
+        Returns a 2D array of percent of target values and a 2D array
+        of pass/fail states, both with one row per sample and one
+        column per target read count.
+    """
+    perct_of_target = (
+        np.array(sample_counts, dtype=np.float64)[:, np.newaxis] / 2
+        / np.array(target_counts, dtype=np.float64)[np.newaxis, :]
+        * 100
+    )
+    # Round each value with round(), rather than np.round(), to keep the
+    # original per-cell rounding.
+    perct_of_target = np.array(
+        [round(perct, 2) for perct in perct_of_target.ravel().tolist()],
+        dtype=np.float64
+    ).reshape(perct_of_target.shape)
+    is_passed_perct_target = perct_of_target >= target_min_perct
+    return perct_of_target, is_passed_perct_target
+
+# __END__
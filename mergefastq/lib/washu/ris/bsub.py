@@ -6,10 +6,14 @@
 # Created     : Tue Sep 24 15:33:28 CDT 2024
 # Copyright   : Copyright (C) 2024 by T.N. Wylie. All rights reserved.
 
+import itertools
 import os
+import subprocess
 import yaml  # type: ignore
 from datetime import datetime
+from pathlib import Path
 from shutil import copyfile
+from typing import Optional
 
 
 class Bsub:
@@ -24,17 +28,22 @@ class Bsub:
     Imports
     -------
 
+    itertools
     os
+    subprocess
     yaml
     datetime
+    pathlib (Path)
     shutil (copyfile)
+    typing (Optional)
 
     Parameters
     ----------
 
-    docker_volumes : dict
+    docker_volumes : dict, default: None
         Dictionary holds key:value pairs for Docker-style volume
-        mappings.
+        mappings. The object keeps its own copy of the dictionary, to
+        which the current working directory is added.
 
     docker_preserve_environment : bool, default: False
         Turns preserving the local RIS environment on/off when running a
@@ -101,10 +110,10 @@ class Bsub:
     resource_span_hosts : int, default: 1
         Sets the number of hosts to request for the bsub job.
 
-    current_working_dir : str, default: os.getcwd()
+    current_working_dir : str, default: None
         Sets the current working directory for the bsub jobs. Unless
-        specified, the default is the current working directory where
-        the script calling the class was executed.
+        specified, the default is the current working directory at the
+        time the object is created.
 
     command : str | list
         If command is set to a string (command file path) then the code
@@ -173,7 +182,9 @@ class Bsub:
         ERROR MESSAGE: A required value was not found.
 
     FileExistsError
-        The log_dir directory already existed.
+        The log_dir path already existed as a file. An existing log_dir
+        directory is reused, not an error, so several jobs may share
+        one log directory.
 
     Examples
     --------
@@ -243,10 +254,13 @@ class Bsub:
     """
 
     execution_counter = 0  # Counts execute() instances.
+    # Hands out job ids; next() on a count is atomic, unlike += on
+    # execution_counter, so ids stay unique if jobs execute in threads.
+    __execution_ids = itertools.count(1)
 
     def __init__(
             self,
-            docker_volumes: dict = {},
+            docker_volumes: Optional[dict] = None,
             docker_preserve_environment: bool = False,
             docker_image: str = '',
             memory_max: str = '8G',
@@ -267,7 +281,7 @@ class Bsub:
             resource_usage_memory: str = '8G',
             resource_usage_tmp: str = '',
             resource_span_hosts: int = 1,
-            current_working_dir: str = os.getcwd(),
+            current_working_dir: Optional[str] = None,
             command: str = ''
     ) -> None:
         """
@@ -277,6 +291,12 @@ class Bsub:
         class Parameters section.
         """
 
+        if docker_volumes is None:
+            docker_volumes = dict()
+
+        if current_working_dir is None:
+            current_working_dir = os.getcwd()
+
         self.set_docker_volumes(docker_volumes)
         self.set_docker_preserve_environment(docker_preserve_environment)
         self.set_docker_image(docker_image)
@@ -311,7 +331,9 @@ class Bsub:
                 method='set_docker_volumes',
                 error_code='must be of dict type'
             )
-        self.docker_volumes = value
+        # Keep our own copy; the working directory volume is added to
+        # it when the bsub command is formulated.
+        self.docker_volumes = dict(value)
         return
 
     def set_docker_preserve_environment(self, value: bool) -> None:
@@ -619,185 +641,188 @@ class Bsub:
 
     # PRIVATE: FORMULATE COMMAND ##############################################
 
-    def __formulate_bsub_command(self) -> None:
+    def __formulate_bsub_command(self) -> str:
         """
         Create the object's bsub commands.
 
+        Returns
+        -------
+        str
+            The qualified path to the log directory, for use when
+            writing the bsub files. It is returned, rather than stored,
+            so that it is not written to the config file.
+
         Examples
         --------
-        self.__formulate_bsub_command()
+        log_dir_path = self.__formulate_bsub_command()
         """
 
         self.__eval_settings()
 
-        log_dir = os.path.join(self.current_working_dir, self.log_dir)
-
-        cmd_error_log = '-e {}'.format(os.path.join(log_dir, self.error_log))
-
-        cmd_output_log = '-o {}'.format(os.path.join(log_dir, self.output_log))
-
-        self.docker_volumes.update(
-            {self.current_working_dir: self.current_working_dir}
-        )
-
-        volume_pairs = list()
-        for i in self.docker_volumes.keys():
-            pair = ':'.join([i, self.docker_volumes[i]])
-            volume_pairs.append(pair)
+        log_dir_path = os.path.join(self.current_working_dir, self.log_dir)
 
-        cmd_docker_volumes = 'LSF_DOCKER_VOLUMES="{}"'.format(
-            ' '.join(volume_pairs)
+        # The working directory is always mounted. The object holds its
+        # own docker_volumes copy, so the caller's dict is untouched.
+        self.docker_volumes[self.current_working_dir] = (
+            self.current_working_dir
         )
 
-        cmd_docker_preserve_environment = (
-            'LSF_DOCKER_PRESERVE_ENVIRONMENT={}'.format(
-                str(self.docker_preserve_environment).lower()
-            )
-        )
-
-        cmd_group = '-G {}'.format(self.group)
-
-        cmd_queue = '-q {}'.format(self.queue)
-
-        cmd_memory_max = '-M {}'.format(self.memory_max)
-
-        cmd_docker_image = "-a 'docker({})'".format(self.docker_image)
+        volume_pairs = [
+            f'{src}:{dest}' for src, dest in self.docker_volumes.items()
+        ]
 
         if self.resource_tmp:
-            resource_memory = 'select[mem>{} && tmp>{}]'.format(
-                self.resource_memory, self.resource_tmp
+            resource_memory = (
+                f'select[mem>{self.resource_memory} && '
+                f'tmp>{self.resource_tmp}]'
             )
         else:
-            resource_memory = 'select[mem>{}]'.format(self.resource_memory)
-
-        resource_span_hosts = 'span[hosts={}]'.format(self.resource_span_hosts)
+            resource_memory = f'select[mem>{self.resource_memory}]'
 
         if self.resource_usage_tmp:
-            resource_usage_memory = 'rusage[mem={}, tmp={}]'.format(
-                self.resource_usage_memory, self.resource_usage_tmp
-            )
-        else:
             resource_usage_memory = (
-                'rusage[mem={}]'.format(self.resource_usage_memory)
+                f'rusage[mem={self.resource_usage_memory}, '
+                f'tmp={self.resource_usage_tmp}]'
             )
+        else:
+            resource_usage_memory = f'rusage[mem={self.resource_usage_memory}]'
 
-        resource_params = ' '.join([
-            resource_memory,
-            resource_span_hosts,
-            resource_usage_memory
-        ])
-
-        resource_command = '-R "{}"'.format(resource_params)
-
-        command_file = os.path.join(
-            self.current_working_dir, self.log_dir, self.command_name
-        )
-        self.command_file = command_file
-        cmd = 'sh {}'.format(self.command_file)
-
-        bsub_cmd_head = ' '.join([
-            cmd_docker_preserve_environment,
-            cmd_docker_volumes,
-            'bsub',
-        ])
+        self.command_file = os.path.join(log_dir_path, self.command_name)
 
-        bsub_cmd_tail = ' '.join([
-            resource_command,
-            cmd_memory_max,
-            cmd_group,
-            cmd_queue,
-            cmd_output_log,
-            cmd_error_log,
-            cmd_docker_image,
-            cmd
-        ])
+        preserve_environment = str(self.docker_preserve_environment).lower()
+        docker_volumes = ' '.join(volume_pairs)
 
-        optional_params = list()
+        bsub_params = [
+            f'LSF_DOCKER_PRESERVE_ENVIRONMENT={preserve_environment}',
+            f'LSF_DOCKER_VOLUMES="{docker_volumes}"',
+            'bsub'
+        ]
 
         if self.job_name:
-            optional_job_name = '-J "{}"'.format(self.job_name)
-            optional_params.append(optional_job_name)
+            bsub_params.append(f'-J "{self.job_name}"')
 
         if self.number_of_tasks:
-            optinal_number_of_tasks = '-n {}'.format(self.number_of_tasks)
-            optional_params.append(optinal_number_of_tasks)
+            bsub_params.append(f'-n {self.number_of_tasks}')
 
         if self.kill_time:
-            optional_kill_time = '-W {}'.format(self.kill_time)
-            optional_params.append(optional_kill_time)
+            bsub_params.append(f'-W {self.kill_time}')
 
         if self.email:
-            email = '-N -u "{}"'.format(self.email)
-            optional_params.append(email)
+            bsub_params.append(f'-N -u "{self.email}"')
+
+        bsub_params.extend([
+            f'-R "{resource_memory} span[hosts={self.resource_span_hosts}] '
+            f'{resource_usage_memory}"',
+            f'-M {self.memory_max}',
+            f'-G {self.group}',
+            f'-q {self.queue}',
+            f'-o {os.path.join(log_dir_path, self.output_log)}',
+            f'-e {os.path.join(log_dir_path, self.error_log)}',
+            f"-a 'docker({self.docker_image})'",
+            f'sh {self.command_file}'
+        ])
 
-        if optional_params:
-            j_optional_params = ' '.join(optional_params)
-            self.full_bsub_command = ' '.join(
-                [bsub_cmd_head, j_optional_params, bsub_cmd_tail]
-            )
-        else:
-            self.full_bsub_command = ' '.join([bsub_cmd_head, bsub_cmd_tail])
+        self.full_bsub_command = ' '.join(bsub_params)
 
         now = datetime.now()
         self.date_time = now.strftime('%d/%m/%Y %I:%M:%S %p')
 
-        return
+        return log_dir_path
 
     # PRIVATE: WRITE CONFIG FILE ##############################################
 
-    def __write_config_file(self) -> None:
+    def __write_config_file(self, log_dir_path: str) -> None:
         """
         Write the config file to disk.
 
+        Parameters
+        ----------
+        log_dir_path : str
+            The qualified path to the log directory.
+
         Examples
         --------
-        self.__write_config_file()
+        self.__write_config_file(log_dir_path=log_dir_path)
         """
-        config_file = os.path.join(self.log_dir, self.config)
+        config_file = os.path.join(log_dir_path, self.config)
+        # Use the LibYAML safe dumper when PyYAML was built with it. The
+        # safe dumpers only represent plain types, so Path objects and
+        # tuples are converted first.
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
         with open(config_file, 'w') as fh:
-            yaml.dump(self.__dict__, fh)
+            yaml.dump(self.__to_plain(self.__dict__), fh, Dumper=dumper)
         return
 
+    def __to_plain(self, value):
+        """
+        Convert a config value to plain types for YAML output.
+
+        Parameters
+        ----------
+        value
+            A config value; dictionaries, lists and tuples are
+            converted recursively.
+
+        Examples
+        --------
+        self.__to_plain(self.__dict__)
+        """
+        if isinstance(value, dict):
+            return {key: self.__to_plain(val) for key, val in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return [self.__to_plain(val) for val in value]
+        elif isinstance(value, Path):
+            return str(value)
+        else:
+            return value
+
     # PRIVATE: MAKE LOG DIR ###################################################
 
-    def __make_log_dir(self) -> None:
+    def __make_log_dir(self, log_dir_path: str) -> None:
         """
-        Make the log directory.
+        Make the log directory, unless it already exists.
+
+        An existing log directory is reused rather than raising
+        FileExistsError, so several jobs may write into one log
+        directory. Only a non-directory at log_dir_path is an error.
+
+        Parameters
+        ----------
+        log_dir_path : str
+            The qualified path to the log directory.
 
         Raises
         ------
         FileExistsError
-            The log_dir directory already existed.
+            The log_dir path already existed as a file.
 
         Examples
         --------
-        self.__make_log_dir()
+        self.__make_log_dir(log_dir_path=log_dir_path)
         """
 
-        log_dir = os.path.join(self.current_working_dir, self.log_dir)
-
-        if os.path.isdir(log_dir):
-            raise FileExistsError(
-                'The log_dir directory already exists.', log_dir
-            )
-        else:
-            os.mkdir(log_dir)
+        Path(log_dir_path).mkdir(exist_ok=True)
 
         return
 
     # PRIVATE: WRITE BSUB COMMAND FILE ########################################
 
-    def __write_bsub_command_file(self) -> None:
+    def __write_bsub_command_file(self, log_dir_path: str) -> None:
         """
         Write the bsub command file to disk.
 
+        Parameters
+        ----------
+        log_dir_path : str
+            The qualified path to the log directory.
+
         Examples
         --------
-        self.__write_bsub_command_file()
+        self.__write_bsub_command_file(log_dir_path=log_dir_path)
         """
 
         bsub_command_path = os.path.join(
-            self.current_working_dir, self.log_dir, self.bsub_command_name
+            log_dir_path, self.bsub_command_name
         )
         self.bsub_command_file = bsub_command_path
 
@@ -823,8 +848,9 @@ class Bsub:
         elif type(self.command) is list:
             # We will write the command file.
             with open(self.command_file, 'w') as fh:
-                for line in self.command:
-                    fh.write(line + '\n')
+                # Each line ends in a newline; an empty list writes an
+                # empty file.
+                fh.write(''.join(line + '\n' for line in self.command))
 
         return
 
@@ -848,26 +874,28 @@ class Bsub:
         job.execute(dry=True)
         """
 
-        self.__formulate_bsub_command()
+        log_dir_path = self.__formulate_bsub_command()
 
-        if os.path.isdir(self.log_dir) is False:
-            self.__make_log_dir()
+        self.__make_log_dir(log_dir_path=log_dir_path)
 
-        self.__write_config_file()
+        self.__write_config_file(log_dir_path=log_dir_path)
 
-        self.__write_bsub_command_file()
+        self.__write_bsub_command_file(log_dir_path=log_dir_path)
 
         self.__write_command_file()
 
-        Bsub.execution_counter += 1
+        job_id = next(Bsub.__execution_ids)
+        Bsub.execution_counter = job_id
 
         if dry is True:
             pass
         else:
             print('Running job {}: {}'.format(
-                Bsub.execution_counter, self.bsub_command_file)
+                job_id, self.bsub_command_file)
                   )
-            os.system('sh ' + self.bsub_command_file)
+            # Run sh directly, rather than through os.system(), which
+            # starts an extra shell to parse the command line.
+            subprocess.run(['sh', self.bsub_command_file], check=False)
 
         return
 
@@ -916,6 +944,7 @@ class Bsub:
         --------
         job.reset_execution_counter()
         """
+        Bsub.__execution_ids = itertools.count(1)
         Bsub.execution_counter = 0
         return
 